@@ -0,0 +1,143 @@
+"""Measure how sibling GraphQL query fields resolve, per session mode.
+
+Runs a document selecting `--fields` aliased `users` pages (distinct pages,
+so nothing is coalesced) against a seeded SQLite file, with the sync and the
+async driver, both with one session shared by every field (the fields wait
+for each other on it) and with a session per field (`GRAPHQL_FIELD_SESSIONS`,
+the fields run concurrently). `--latency-ms` is added to every statement to
+model the round trip to a database server; SQLite answers locally.
+
+Usage:
+    poetry run python -m benchmarks.bench_graphql_concurrency --fields 8
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, List
+
+from sqlalchemy import event, insert
+from sqlalchemy.engine import AdaptedConnection, Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.config.config import settings
+from src.database.base import Base
+from src.database.engine import create_async_db_engine, create_db_engine
+from src.graphql.context import Context
+from src.graphql.schemas.schema import schema
+from src.model.user import User
+from src.services.async_user import AsyncUserService
+
+MODES = [
+    ("sync, shared session", False, False),
+    ("sync, session per field", False, True),
+    ("async, shared session", True, False),
+    ("async, session per field", True, True),
+]
+
+
+def make_document(fields: int, page_size: int) -> str:
+    """Build a query selecting `fields` distinct pages of users."""
+    selections = " ".join(
+        f"p{i}: users(limit: {page_size}, afterId: {i * page_size}) {{ id name }}"
+        for i in range(fields)
+    )
+    return f"{{ {selections} }}"
+
+
+def add_latency(engine: Engine, latency: float) -> None:
+    """Make every statement of `engine` take `latency` more seconds.
+
+    The delay is added by SQLite's trace callback, i.e. in the thread running
+    the statement, so that with the async driver it blocks aiosqlite's thread
+    and not the event loop, like waiting for a server would.
+    """
+
+    @event.listens_for(engine, "connect")
+    def trace(dbapi_connection: Any, record: Any) -> None:
+        def wait(statement: str) -> None:
+            time.sleep(latency)
+
+        if isinstance(dbapi_connection, AdaptedConnection):
+            dbapi_connection.await_(
+                dbapi_connection.driver_connection.set_trace_callback(wait)
+            )
+        else:
+            dbapi_connection.set_trace_callback(wait)
+
+
+async def time_mode(
+    engine: Any, is_async: bool, field_sessions: bool, document: str, requests: int
+) -> List[float]:
+    """Execute the document `requests` times, timing each execution."""
+    timings = []
+    for _ in range(requests):
+        db = AsyncSession(bind=engine) if is_async else Session(bind=engine)
+        context = Context(AsyncUserService(db), field_sessions=field_sessions)
+        start = time.perf_counter()
+        result = await schema.execute(document, context_value=context)
+        timings.append(time.perf_counter() - start)
+        assert result.errors is None, result.errors
+        if is_async:
+            await db.close()
+        else:
+            db.close()
+    return timings
+
+
+async def run(fields: int, page_size: int, requests: int, latency: float) -> None:
+    """Seed a database, then time every mode and print a comparison table."""
+    document = make_document(fields, page_size)
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "bench.db"
+        engine = create_db_engine(f"sqlite:///{path}", settings)
+        async_engine = create_async_db_engine(f"sqlite+aiosqlite:///{path}", settings)
+        if latency > 0:
+            add_latency(engine, latency)
+            add_latency(async_engine.sync_engine, latency)
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.execute(
+                insert(User),
+                [{"id": i, "name": f"user-{i}"} for i in range(1, fields * page_size)],
+            )
+            session.commit()
+
+        print(f"{fields} fields x {page_size} users, +{latency * 1000:.1f} ms/query")
+        print(f"{'mode':<26} {'mean (ms)':>10} {'p50 (ms)':>10} {'speedup':>8}")
+        shared = 0.0
+        for name, is_async, field_sessions in MODES:
+            timings = await time_mode(
+                async_engine if is_async else engine,
+                is_async,
+                field_sessions,
+                document,
+                requests,
+            )
+            mean = statistics.mean(timings)
+            shared = mean if not field_sessions else shared
+            print(
+                f"{name:<26} {mean * 1000:>10.2f} "
+                f"{statistics.median(timings) * 1000:>10.2f} {shared / mean:>7.1f}x"
+            )
+        await async_engine.dispose()
+        engine.dispose()
+
+
+def main() -> None:
+    """Parse the command line and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fields", type=int, default=8)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.fields, args.page_size, args.requests, args.latency_ms / 1000))
+
+
+if __name__ == "__main__":
+    main()
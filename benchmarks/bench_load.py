@@ -0,0 +1,351 @@
+"""Load-test the REST and GraphQL APIs against a local server and SQLite database.
+
+A server is started on a free port with a fresh SQLite database, seeded with
+`--users` users, then every scenario is driven by `--concurrency` concurrent
+clients for `--requests` requests:
+
+- get_user: GET /api/v1/user/{id} (random seeded IDs)
+- list_users: GET /api/v1/users?limit=100 (random cursors)
+- create_user: POST /api/v1/user (new IDs above the seeded range)
+- update_user: PUT /api/v1/user/{id} (random seeded IDs)
+- delete_user: DELETE /api/v1/user/{id} (the users created by create_user)
+- token: GET /api/v1/token/{user}
+- graphql_user: `user(id)` query
+- graphql_users: `users(limit: 100)` query
+
+Throughput, p50/p95/p99 latency and errors are printed per scenario and
+written as JSON. With `--check`, the results are compared with the stored
+baseline and the process exits with status 1 when a scenario's p95 latency
+grew, or its throughput dropped, by more than `--tolerance`. Baselines only
+compare well on the machine (and settings) they were recorded with; record
+one with `--update-baseline`.
+
+Usage:
+    poetry run python -m benchmarks.bench_load --check
+    poetry run python -m benchmarks.bench_load --update-baseline
+    poetry run python -m benchmarks.bench_load --workers 4 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+
+import httpx
+
+from benchmarks.bench_startup import git_commit
+
+RESULTS_DIR = Path(__file__).parent / "results"
+BASELINE_FILE = RESULTS_DIR / "load_baseline.json"
+
+# Seconds an idle client connection is kept; below the server's keep-alive
+# timeout (5 s, uvicorn's default and SERVER_KEEPALIVE_SECONDS), so a request
+# never reuses a connection the server is closing (a spurious ReadError)
+CLIENT_KEEPALIVE_EXPIRY = 2.0
+
+GRAPHQL_USER = "query ($id: Int!) { user(id: $id) { id name } }"
+GRAPHQL_USERS = "query ($after: Int) { users(limit: 100, afterId: $after) { id } }"
+
+# A request of a scenario, given the client and the index of the request
+Request = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+@dataclass
+class ScenarioResult:
+    """Measurements of one scenario."""
+
+    requests: int
+    errors: int
+    throughput_rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+def free_port() -> int:
+    """Return a TCP port that is free on localhost."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, workers: int, data_dir: str) -> subprocess.Popen:
+    """Start the application on a fresh SQLite database.
+
+    Args:
+        port (int): The port to listen on.
+        workers (int): 1 runs uvicorn, more runs the gunicorn production server.
+        data_dir (str): Directory holding the database and metrics files.
+
+    Returns:
+        subprocess.Popen: The server process.
+    """
+    env = {**os.environ, "database_url": f"sqlite:///{data_dir}/bench.db"}
+    env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+    if workers > 1:
+        # The launcher creates the metrics directory before forking
+        env["PROMETHEUS_MULTIPROC_DIR"] = f"{data_dir}/metrics"
+        env.update(
+            SERVER_HOST="127.0.0.1",
+            SERVER_PORT=str(port),
+            SERVER_WORKERS=str(workers),
+        )
+        command = [sys.executable, "-m", "src.utils.server"]
+    else:
+        command = [sys.executable, "-m", "uvicorn", "src.main:app"]
+        command += ["--port", str(port), "--log-level", "warning"]
+    return subprocess.Popen(
+        command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float = 30) -> None:
+    """Poll the health endpoint until the server answers.
+
+    Raises:
+        TimeoutError: If the server is not up within `timeout` seconds.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/api/v1/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise TimeoutError("The server did not start")
+
+
+async def seed(client: httpx.AsyncClient, users: int, chunk: int = 10000) -> None:
+    """Insert users 1..`users` through the bulk endpoint."""
+    for start in range(1, users + 1, chunk):
+        ids = range(start, min(start + chunk, users + 1))
+        payload = {"users": [{"id": i, "name": f"user-{i}"} for i in ids]}
+        response = await client.post("/api/v1/users/bulk", json=payload)
+        response.raise_for_status()
+
+
+def has_graphql_errors(response: httpx.Response) -> bool:
+    """Return whether a GraphQL response reports errors (sent with a 200)."""
+    return response.request.url.path == "/graphql" and "errors" in response.json()
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, request: Request, requests: int, concurrency: int
+) -> ScenarioResult:
+    """Send `requests` requests from `concurrency` concurrent clients.
+
+    Args:
+        client (httpx.AsyncClient): The client, with enough connections.
+        request (Request): Sends request number `i`.
+        requests (int): Total number of requests.
+        concurrency (int): Requests in flight at any time.
+
+    Returns:
+        ScenarioResult: The measurements; non-2xx responses and GraphQL
+            errors count as errors.
+    """
+    latencies: List[float] = []
+    errors = 0
+    indexes = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in indexes:
+            start = time.perf_counter()
+            try:
+                response = await request(client, i)
+                ok = response.is_success and not has_graphql_errors(response)
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - start)
+            errors += not ok
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return ScenarioResult(
+        requests=requests,
+        errors=errors,
+        throughput_rps=round(requests / elapsed, 1),
+        p50_ms=round(percentiles[49] * 1000, 2),
+        p95_ms=round(percentiles[94] * 1000, 2),
+        p99_ms=round(percentiles[98] * 1000, 2),
+    )
+
+
+def scenarios(users: int) -> Dict[str, Request]:
+    """Build the scenarios, in the order they must run (delete after create)."""
+    rng = random.Random(0)
+
+    def graphql(query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        return {"query": query, "variables": variables}
+
+    return {
+        "get_user": lambda c, i: c.get(f"/api/v1/user/{rng.randint(1, users)}"),
+        "list_users": lambda c, i: c.get(
+            "/api/v1/users",
+            params={"limit": 100, "after_id": rng.randrange(0, max(users - 100, 1))},
+        ),
+        "create_user": lambda c, i: c.post(
+            "/api/v1/user", json={"id": users + 1 + i, "name": f"new-{i}"}
+        ),
+        "update_user": lambda c, i: c.put(
+            f"/api/v1/user/{(user_id := rng.randint(1, users))}",
+            json={"id": user_id, "name": f"renamed-{i}"},
+        ),
+        "delete_user": lambda c, i: c.delete(f"/api/v1/user/{users + 1 + i}"),
+        "token": lambda c, i: c.get(f"/api/v1/token/bench-{i}"),
+        "graphql_user": lambda c, i: c.post(
+            "/graphql", json=graphql(GRAPHQL_USER, {"id": rng.randint(1, users)})
+        ),
+        "graphql_users": lambda c, i: c.post(
+            "/graphql",
+            json=graphql(GRAPHQL_USERS, {"after": rng.randrange(0, users)}),
+        ),
+    }
+
+
+async def benchmark(
+    users: int, requests: int, concurrency: int, workers: int
+) -> Dict[str, ScenarioResult]:
+    """Start a server, seed it and run every scenario against it."""
+    port = free_port()
+    limits = httpx.Limits(
+        max_connections=concurrency, keepalive_expiry=CLIENT_KEEPALIVE_EXPIRY
+    )
+    with tempfile.TemporaryDirectory() as data_dir:
+        server = start_server(port, workers, data_dir)
+        try:
+            async with httpx.AsyncClient(
+                base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=30
+            ) as client:
+                await wait_until_ready(client)
+                token = (await client.get("/api/v1/token/bench")).json()
+                client.headers["Authorization"] = f"Bearer {token['access_token']}"
+                await seed(client, users)
+
+                results = {}
+                for name, request in scenarios(users).items():
+                    # Warm up connections and caches without recording
+                    if name in ("get_user", "graphql_user"):
+                        await run_scenario(client, request, concurrency, concurrency)
+                    results[name] = await run_scenario(
+                        client, request, requests, concurrency
+                    )
+                    print(format_result(name, results[name]))
+                return results
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def format_result(name: str, result: ScenarioResult) -> str:
+    """Format the measurements of a scenario as one line."""
+    return (
+        f"{name:<14} {result.throughput_rps:>9.1f} req/s  p50 {result.p50_ms:>7.2f} "
+        f"ms  p95 {result.p95_ms:>7.2f} ms  p99 {result.p99_ms:>7.2f} ms  "
+        f"errors {result.errors}"
+    )
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float,
+) -> List[str]:
+    """Compare scenario results with a baseline.
+
+    Args:
+        results (Dict[str, Dict[str, Any]]): Scenario measurements.
+        baseline (Dict[str, Dict[str, Any]]): Baseline scenario measurements.
+        tolerance (float): Allowed relative regression, e.g. 0.25 for 25%.
+
+    Returns:
+        List[str]: One message per regression; empty when there are none.
+    """
+    regressions = []
+    for name, result in results.items():
+        if result["errors"]:
+            regressions.append(f"{name}: {result['errors']} failed requests")
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        if result["p95_ms"] > reference["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {result['p95_ms']:.2f} ms vs "
+                f"{reference['p95_ms']:.2f} ms baseline"
+            )
+        if result["throughput_rps"] < reference["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {result['throughput_rps']:.1f} req/s vs "
+                f"{reference['throughput_rps']:.1f} req/s baseline"
+            )
+    return regressions
+
+
+def main() -> None:
+    """Parse the command line, run the benchmark and check for regressions."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--output", type=Path, default=RESULTS_DIR / "load.json")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--tolerance", type=float, default=0.3)
+    parser.add_argument("--check", action="store_true")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    scenario_results = asyncio.run(
+        benchmark(args.users, args.requests, args.concurrency, args.workers)
+    )
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "config": {
+            "users": args.users,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "workers": args.workers,
+        },
+        "scenarios": {name: asdict(r) for name, r in scenario_results.items()},
+    }
+    args.output.parent.mkdir(exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"Results written to {args.output}")
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+    elif args.check:
+        if not args.baseline.exists():
+            sys.exit(f"No baseline at {args.baseline}, record one first")
+        baseline = json.loads(args.baseline.read_text())
+        if baseline["config"] != report["config"]:
+            print("⚠️ Baseline was recorded with a different configuration")
+        regressions = compare(
+            report["scenarios"], baseline["scenarios"], args.tolerance
+        )
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regression beyond {args.tolerance:.0%} of the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Measure the time request handlers spend logging, per logging mode.
+
+Each mode logs the hot-path lines of a `GET /user/{id}` request (auth,
+endpoint and service) to a stdout stand-in and a file sink shaped like the
+app's, and reports the mean and p99 time the caller is blocked per request.
+loguru flushes streams on every line; `--flush-latency-us` models how long
+such a flush blocks when stdout is a pipe to a busy log collector.
+
+Usage:
+    poetry run python -m benchmarks.bench_logging --requests 5000
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from loguru import logger
+
+from src.utils.logger import (
+    FILE_FORMAT,
+    STDOUT_FORMAT,
+    BackgroundSink,
+    SampledLogger,
+)
+
+
+class SlowStream:
+    """File wrapper whose flush blocks like a write to a busy pipe."""
+
+    def __init__(self, path: Path, flush_latency: float):
+        self.file = open(path, "w")
+        self.flush_latency = flush_latency
+
+    def write(self, message: str) -> None:
+        self.file.write(message)
+
+    def flush(self) -> None:
+        self.file.flush()
+        time.sleep(self.flush_latency)
+
+    def close(self) -> None:
+        self.file.close()
+
+
+MODES = [
+    ("sync", False, 1.0),
+    ("background", True, 1.0),
+    ("background, 10% sampled", True, 0.1),
+]
+
+
+def simulate_requests(hot_logger: SampledLogger, requests: int) -> List[float]:
+    """Log the hot-path lines of `requests` requests, timing each request."""
+    timings = []
+    for id in range(requests):
+        start = time.perf_counter()
+        hot_logger.sample()
+        hot_logger.info("🔑 Authenticating user from Authorization header")
+        hot_logger.info("🔍 Verifying JWT token")
+        hot_logger.success("✅ Token verified successfully")
+        hot_logger.info("Fetching user with id={}", id)
+        hot_logger.info("🔍 Fetching user with ID {}", id)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run(requests: int, flush_latency: float) -> None:
+    """Time every logging mode and print a comparison table."""
+    print(f"{'mode':>26} {'mean (us)':>10} {'p99 (us)':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, enqueue, sample_rate in MODES:
+            logger.remove()
+            stdout = SlowStream(Path(tmp) / "stdout.log", flush_latency)
+            logger.add(
+                BackgroundSink(stdout) if enqueue else stdout, format=STDOUT_FORMAT
+            )
+            logger.add(Path(tmp) / "bench.log", format=FILE_FORMAT)
+            timings = simulate_requests(SampledLogger(sample_rate), requests)
+            # Drain the queue so the next mode starts from an idle writer
+            logger.remove()
+            stdout.close()
+            p99 = statistics.quantiles(timings, n=100)[98]
+            print(
+                f"{name:>26} {statistics.fmean(timings) * 1e6:>10.1f} "
+                f"{p99 * 1e6:>10.1f}"
+            )
+
+
+def main() -> None:
+    """Parse the command line and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--flush-latency-us", type=float, default=50.0)
+    args = parser.parse_args()
+    run(args.requests, args.flush_latency_us / 1e6)
+
+
+if __name__ == "__main__":
+    main()
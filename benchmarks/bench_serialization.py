@@ -0,0 +1,77 @@
+"""Compare the default and the fast response serialization of GET /users.
+
+The default path is what FastAPI does with `response_model`: validate the
+returned dict into `UserFetchAllResponse`, serialize it back to Python data
+and encode that with the stdlib `json` encoder. The fast path
+(`FAST_SERIALIZATION=true`) skips validation and encodes the service's dicts
+once with orjson.
+
+Usage:
+    poetry run python -m benchmarks.bench_serialization --sizes 10 100 1000
+"""
+
+import argparse
+import json
+import timeit
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.utils import create_model_field
+
+from src.schema.user import UserFetchAllResponse
+from src.utils.serialization import user_page_response
+
+RESPONSE_FIELD = create_model_field(name="Response", type_=UserFetchAllResponse)
+
+
+def make_page(size: int) -> dict:
+    """Build a `UserService.get_users` style page with `size` users."""
+    return {
+        "users": [{"id": i, "name": f"user-{i}"} for i in range(size)],
+        "next_cursor": None,
+    }
+
+
+def default_path(page: dict) -> bytes:
+    """Serialize a page the way FastAPI does for a `response_model` route.
+
+    Mirrors `fastapi.routing.serialize_response` for an async endpoint.
+    """
+    value, errors = RESPONSE_FIELD.validate(page, {}, loc=("response",))
+    assert not errors
+    return bytes(JSONResponse(RESPONSE_FIELD.serialize(value)).body)
+
+
+def fast_path(page: dict) -> bytes:
+    """Serialize a page with the fast serialization mode."""
+    return bytes(user_page_response(page).body)
+
+
+def run(sizes: List[int], repeat: int) -> None:
+    """Time both paths for every payload size and print a comparison table."""
+    print(f"{'users':>8} {'default (ms)':>14} {'fast (ms)':>11} {'speedup':>8}")
+    for size in sizes:
+        page = make_page(size)
+        assert json.loads(default_path(page)) == json.loads(fast_path(page))
+        number = max(1, 20000 // max(size, 1))
+        default = min(
+            timeit.repeat(lambda: default_path(page), number=number, repeat=repeat)
+        )
+        fast = min(timeit.repeat(lambda: fast_path(page), number=number, repeat=repeat))
+        print(
+            f"{size:>8} {default / number * 1000:>14.3f} "
+            f"{fast / number * 1000:>11.3f} {default / fast:>7.1f}x"
+        )
+
+
+def main() -> None:
+    """Parse the command line and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
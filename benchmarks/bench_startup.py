@@ -0,0 +1,102 @@
+"""Measure how long the application takes to import and to serve a first request.
+
+Every sample runs in a fresh interpreter:
+
+- import: cumulative `python -X importtime` time of `src.main`.
+- cold start: wall time from launching the interpreter to the first
+  `GET /api/v1/health` response, startup (lifespan) included.
+
+Results can be appended to a JSON-lines file to track them across commits.
+
+Usage:
+    poetry run python -m benchmarks.bench_startup --runs 5 --record
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List
+
+RESULTS_FILE = Path(__file__).parent / "results" / "startup.jsonl"
+
+FIRST_REQUEST = """
+from fastapi.testclient import TestClient
+from src.main import app
+with TestClient(app) as client:
+    assert client.get("/api/v1/health").status_code == 200
+"""
+
+
+def import_time_ms(module: str) -> float:
+    """Return the cumulative import time of a module in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Lines look like "import time:  self [us] | cumulative | imported package"
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1]) / 1000
+    raise RuntimeError(f"{module} not found in -X importtime output")
+
+
+def cold_start_ms() -> float:
+    """Return the time from interpreter launch to the first response."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", FIRST_REQUEST], capture_output=True, check=True
+    )
+    return (time.perf_counter() - start) * 1000
+
+
+def git_commit() -> str:
+    """Return the current commit hash, or `unknown` outside a checkout.
+
+    The hash ends with `-dirty` when the tree has uncommitted changes, since
+    the measurement is then not of that commit.
+    """
+    result = subprocess.run(
+        ["git", "describe", "--always", "--dirty"], capture_output=True, text=True
+    )
+    return result.stdout.strip() or "unknown"
+
+
+def run(runs: int, record: bool) -> None:
+    """Sample both measurements, print their medians and optionally record them."""
+    imports: List[float] = [import_time_ms("src.main") for _ in range(runs)]
+    starts: List[float] = [cold_start_ms() for _ in range(runs)]
+    result = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "runs": runs,
+        "import_ms": round(statistics.median(imports), 1),
+        "cold_start_ms": round(statistics.median(starts), 1),
+    }
+    print(f"import src.main: {result['import_ms']:.1f} ms (median of {runs})")
+    print(f"cold start to first response: {result['cold_start_ms']:.1f} ms")
+    if record:
+        RESULTS_FILE.parent.mkdir(exist_ok=True)
+        with RESULTS_FILE.open("a") as f:
+            f.write(json.dumps(result) + "\n")
+        print(f"Recorded in {RESULTS_FILE}")
+
+
+def main() -> None:
+    """Parse the command line and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--record", action="store_true")
+    args = parser.parse_args()
+    run(args.runs, args.record)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+# gunicorn.conf.py
+
+from src.config.config import settings
+from src.utils.server import gunicorn_options, prepare_metrics_dir
+
+# Same worker model as `poetry run serve` (see src/utils/server.py); must run
+# before gunicorn preloads the app
+prepare_metrics_dir(settings)
+globals().update(gunicorn_options(settings))